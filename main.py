@@ -58,6 +58,11 @@ def main():
     show_info = True
     show_debug = False
     
+    # Font opened once; rendered lines are memoized because most of them
+    # only change when a counter or timer value ticks over
+    info_font = pygame.font.Font(None, 36)
+    text_cache = {}
+    
     print("\nTraffic Simulation Started!")
     print("🚦 Traffic lights are cycling automatically (15s green, no yellow)")
     print("🚗 Vehicle spawning is OFF - press V to enable cars")
@@ -76,6 +81,8 @@ def main():
         current_time = time.time()
         
         for event in pygame.event.get():
+            if traffic_light_manager.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -118,7 +125,6 @@ def main():
             vehicle_spawner.draw_debug_info(screen)
         
         if show_info:
-            font = pygame.font.Font(None, 36)
             y_offset = 50
             
             vehicle_count = vehicle_spawner.get_vehicle_count()
@@ -139,7 +145,11 @@ def main():
             controls_info = "Controls: V=Toggle Spawning | C=Clear | I=Info | D=Debug | R=Reset | ESC=Exit"
             
             for text in [vehicle_info, road_info, traffic_info, controls_info]:
-                text_surface = font.render(text, True, (255, 255, 255))
+                text_surface = text_cache.get(text)
+                if text_surface is None:
+                    if len(text_cache) > 256:  # timer text churns; don't grow forever
+                        text_cache.clear()
+                    text_cache[text] = text_surface = info_font.render(text, True, (255, 255, 255))
                 screen.blit(text_surface, (50, y_offset))
                 y_offset += 40
         
@@ -1,124 +1,312 @@
 # traffic_lights.py
 
+from __future__ import annotations
+
 import pygame
+import sys
 import math
 import time
-from dataclasses import dataclass
-from typing import List, Optional
-from enum import Enum
+import logging
+import itertools
+import numpy as np
+from typing import Dict, List, Optional
+from enum import IntEnum
+
+# Numba is optional; with it installed the nearest-light scan compiles to
+# native code, without it the NumPy path below is used
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _nearest_light_idx(cx, cy, x, y, max_sq):
+        best_i = -1
+        best = max_sq
+        for i in range(cx.shape[0]):
+            dx = cx[i] - x
+            dy = cy[i] - y
+            d2 = dx * dx + dy * dy
+            if d2 <= best:
+                best = d2
+                best_i = i
+        return best_i
+else:
+    _nearest_light_idx = None
+
+class LightState(IntEnum):
+    # IntEnum so state compares are plain int compares and the value can
+    # index straight into the colors tuple
+    RED = 0
+    GREEN = 1
+
+# Canonical interned road names: dict lookups keyed by these short-circuit
+# on identity before any character compare
+TOP = sys.intern('top')
+RIGHT = sys.intern('right')
+BOTTOM = sys.intern('bottom')
+LEFT = sys.intern('left')
+ROAD_NAMES = (TOP, RIGHT, BOTTOM, LEFT)
+
+# One bit per road name, shared by the batch light queries in TrafficLightManager.
+# Callers can precompute DIR_BITS[road_side] once (e.g. at vehicle spawn).
+DIR_BITS = {TOP: 1 << 0, RIGHT: 1 << 1, BOTTOM: 1 << 2, LEFT: 1 << 3}
+
+log = logging.getLogger(__name__)
 
-class LightState(Enum):
-    RED = "red"
-    GREEN = "green"
+def _config_fingerprint(config: dict) -> int:
+    """Hash the fields that affect light layout into one comparable int"""
+    return hash((config.get('junction_type'), config.get('top_angle'),
+                 config.get('right_angle'), config.get('bottom_angle')))
+
+def _now_ms() -> int:
+    """Millisecond clock for phase timing; integer ticks avoid float drift"""
+    if pygame.get_init():
+        return pygame.time.get_ticks()
+    return int(time.time() * 1000)
 
-@dataclass
 class RoadDirection:
-    angle: float
-    name: str
+    """Lightweight mutable record for one road leg of an intersection.
+
+    Uses __slots__ instead of a dataclass: these are touched in the draw
+    inner loop, and dx/dy leave room for caching the angle's cos/sin.
+    """
+    __slots__ = ('angle', 'name', 'dx', 'dy')
+
+    def __init__(self, angle: float, name: str, dx: float = 0.0, dy: float = 0.0):
+        self.angle = angle
+        self.name = name
+        self.dx = dx
+        self.dy = dy
 
 class TrafficLight:
-    def __init__(self, intersection_center_x, intersection_center_y, road_config, intersection_size=100):
+    # No per-instance __dict__: every attribute is a fixed slot, which
+    # shrinks each light and makes the hot-path attribute reads in
+    # is_red_light/collect_blits C-struct-style offsets
+    __slots__ = (
+        'center_x', 'center_y', 'road_config', 'light_radius', 'segment_width',
+        '_direction_pool', 'road_directions', '_dirs', '_dir_bits',
+        '_active_mask', 'green_mask', 'green_duration', '_period_ms',
+        'cycle_start_ms', 'cycle_order', 'current_green_road', '_phase_iter',
+        'colors', '_bg_surf', '_segment_surfs', 'timer_event_id',
+        '_timer_armed', '_config_hash', 'light_id',
+    )
+
+    # Pre-rendered surfaces shared by every light with the same geometry
+    # and palette, so N lights keep one copy of each bitmap
+    _surface_cache: Dict[tuple, tuple] = {}
+
+    # SDL timer events are routed back to their light through this registry,
+    # so phase switches cost O(1) per actual transition instead of a
+    # time.time() poll per light per frame
+    _event_registry: Dict[int, "TrafficLight"] = {}
+
+    def __init__(self, intersection_center_x: float, intersection_center_y: float,
+                 road_config: dict, intersection_size: int = 100):
         self.center_x = intersection_center_x
         self.center_y = intersection_center_y
         self.road_config = road_config
+        self.light_id = 0  # reassigned by TrafficLightManager
         self.light_radius = 25
         self.segment_width = 8
+        # Direction objects are created once and mutated in place on config
+        # changes, so slider drags in the GUI don't churn the allocator
+        self._direction_pool = {
+            TOP: RoadDirection(270, TOP),
+            RIGHT: RoadDirection(0, RIGHT),
+            BOTTOM: RoadDirection(90, BOTTOM),
+            LEFT: RoadDirection(180, LEFT),
+        }
         self.road_directions = {}
-        self.light_states = {}
-        
+        # Cycle-aligned views of road_directions for the draw hot loop:
+        # integer indexing instead of string-keyed dict lookups
+        self._dirs: List[RoadDirection] = []
+        self._dir_bits: List[int] = []
+        # Light state lives in two bitmasks (DIR_BITS bits): which roads have
+        # a light at all, and which of them is currently green
+        self._active_mask = 0
+        self.green_mask = 0
+
         # --- REQUIREMENT FULFILLED: Green light lasts 15 seconds ---
         self.green_duration = 15.0
-        self.cycle_start_time = time.time()
-        
+        self._period_ms = int(self.green_duration * 1000)
+        self.cycle_start_ms = _now_ms()
+
         self.cycle_order = []
-        self.current_green_index = 0
-        self.colors = { LightState.RED: (255, 50, 50), LightState.GREEN: (50, 255, 50) }
-        
+        self.current_green_road = None
+        self._phase_iter = None
+        self.colors = ((255, 50, 50), (50, 255, 50))  # indexed by LightState value
+        self._build_light_surfaces()
+
+        self.timer_event_id = pygame.USEREVENT + 1 + len(TrafficLight._event_registry)
+        TrafficLight._event_registry[self.timer_event_id] = self
+        self._timer_armed = False
+
+        self._config_hash: Optional[int] = None
         self.update_road_config(road_config)
 
-    def update_road_config(self, new_road_config):
-        # Check if this is the first time or if we need to reinitialize
-        if not hasattr(self, '_config_hash') or self._should_update_config(new_road_config):
-            self.road_config = new_road_config
-            self.road_directions = self._get_road_directions_from_config()
-            self.cycle_order = ['top', 'right', 'bottom', 'left']
-            self.cycle_order = [name for name in self.cycle_order if name in self.road_directions]
-            self._initialize_light_states()
-            self._config_hash = self._get_config_hash(new_road_config)
-            print(f"Traffic light config updated - timer reset")
-    
-    def _should_update_config(self, new_config):
-        """Check if the config has meaningfully changed"""
-        if not hasattr(self, 'road_config') or not self.road_config:
-            return True
-        
-        # Check key values that would affect traffic lights
-        key_fields = ['junction_type', 'top_angle', 'right_angle', 'bottom_angle']
-        for field in key_fields:
-            if self.road_config.get(field) != new_config.get(field):
-                return True
-        return False
-    
-    def _get_config_hash(self, config):
-        """Get a simple hash of the config for comparison"""
-        key_fields = ['junction_type', 'top_angle', 'right_angle', 'bottom_angle']
-        return hash(tuple(config.get(field) for field in key_fields))
+    def _build_light_surfaces(self) -> None:
+        """Rasterize the housing and segment circles once per distinct look.
+
+        Surfaces live in a class-level flyweight cache keyed by geometry and
+        palette, so identical lights share bitmaps and draw just blits.
+        """
+        key = (self.light_radius, self.segment_width, self.colors)
+        cached = TrafficLight._surface_cache.get(key)
+        if cached is None:
+            r = self.light_radius
+            bg_surf = pygame.Surface((2 * r + 1, 2 * r + 1), pygame.SRCALPHA)
+            pygame.draw.circle(bg_surf, (80, 80, 80), (r, r), r)
+
+            sw = self.segment_width
+            segment_surfs = []
+            for color in self.colors:  # one per LightState value
+                surf = pygame.Surface((2 * sw + 1, 2 * sw + 1), pygame.SRCALPHA)
+                pygame.draw.circle(surf, color, (sw, sw), sw)
+                segment_surfs.append(surf)
+            cached = (bg_surf, tuple(segment_surfs))
+            TrafficLight._surface_cache[key] = cached
+        self._bg_surf, self._segment_surfs = cached
+
+    def _start_phase_timer(self) -> None:
+        """(Re)arm the SDL timer that fires one event per green period.
 
-    def _get_road_directions_from_config(self):
-        directions = {}
+        Falls back to per-frame polling in update_timing when pygame isn't
+        initialized (e.g. headless use of this module).
+        """
+        self._period_ms = int(self.green_duration * 1000)
+        if pygame.get_init():
+            pygame.time.set_timer(self.timer_event_id, self._period_ms)
+            self._timer_armed = True
+
+    @classmethod
+    def handle_event(cls, event) -> bool:
+        """Dispatch a timer event from the main event loop to its light.
+
+        Returns True if the event was one of ours and has been consumed.
+        """
+        light = cls._event_registry.get(event.type)
+        if light is None:
+            return False
+        if light.road_config.get('traffic_light_mode', 'timer') == 'timer':
+            light._switch_light_phases()
+            light.cycle_start_ms = _now_ms()
+        return True
+
+    def update_road_config(self, new_road_config: dict, fingerprint: Optional[int] = None) -> None:
+        # One int compare decides whether anything meaningful changed; the
+        # manager passes the fingerprint in so it's hashed once, not per light
+        if fingerprint is None:
+            fingerprint = _config_fingerprint(new_road_config)
+        if fingerprint == self._config_hash:
+            return
+        self.road_config = new_road_config
+        self.road_directions = self._get_road_directions_from_config()
+        self.cycle_order[:] = [name for name in ROAD_NAMES
+                               if name in self.road_directions]
+        self._dirs = [self.road_directions[name] for name in self.cycle_order]
+        self._dir_bits = [DIR_BITS[name] for name in self.cycle_order]
+        self._initialize_light_states()
+        self._config_hash = fingerprint
+        # debug-gated: no stdout write (or string formatting) during
+        # slider-drag config bursts unless someone turns DEBUG on
+        log.debug("Traffic light config updated - timer reset")
+
+    def _get_road_directions_from_config(self) -> Dict[str, RoadDirection]:
+        directions = self.road_directions
         if self.road_config['junction_type'] == 'cross':
-            directions['top'] = RoadDirection(self.road_config['top_angle'], 'top')
-            directions['right'] = RoadDirection(self.road_config['right_angle'], 'right') 
-            directions['bottom'] = RoadDirection(self.road_config['bottom_angle'], 'bottom')
+            pool = self._direction_pool
+            pool[TOP].angle = self.road_config['top_angle']
+            pool[RIGHT].angle = self.road_config['right_angle']
+            pool[BOTTOM].angle = self.road_config['bottom_angle']
             # The 'left' road is always 180 degrees from the 'right' road's origin point
-            directions['left'] = RoadDirection(180, 'left')
+            pool[LEFT].angle = 180
+            # Cache each segment's pixel offset now; angles only change here,
+            # so draw never has to touch math.radians/cos/sin again
+            dist = self.light_radius - 5
+            for direction in pool.values():
+                rad = math.radians(direction.angle)
+                direction.dx = dist * math.cos(rad)
+                direction.dy = dist * math.sin(rad)
+            if not directions:
+                directions.update(pool)
+        else:
+            directions.clear()
         return directions
+
+    def _initialize_light_states(self) -> None:
+        order = self.cycle_order
+        self._active_mask = 0
+        for direction_name in order:
+            self._active_mask |= DIR_BITS[direction_name]
+
+        # Prepare the phase transitions up front so a switch is a single
+        # next() call instead of list indexing plus a modulo
+        n = len(order)
+        if n:
+            phases = [(order[i], order[(i + 1) % n]) for i in range(n)]
+            self._phase_iter = itertools.cycle(phases)
+            first_green = order[0]
+            self.green_mask = DIR_BITS[first_green]
+            self.current_green_road = first_green
+        else:
+            self._phase_iter = None
+            self.green_mask = 0
+            self.current_green_road = None
+        self.cycle_start_ms = _now_ms()
+        self._start_phase_timer()
     
-    def _initialize_light_states(self):
-        for direction_name in self.road_directions.keys():
-            self.light_states[direction_name] = LightState.RED
-        
-        if self.cycle_order:
-            first_green = self.cycle_order[0]
-            self.light_states[first_green] = LightState.GREEN
-        self.current_green_index = 0
-        self.cycle_start_time = time.time()
-    
-    def update_timing(self):
+    def update_timing(self, now_ms: Optional[int] = None) -> None:
         mode = self.road_config.get('traffic_light_mode', 'timer')
         if mode == 'timer':
-            if time.time() - self.cycle_start_time >= self.green_duration:
-                self._switch_light_phases()
-                self.cycle_start_time = time.time()
+            # Polling fallback only; with an armed SDL timer the switch
+            # happens in handle_event and this is just two attribute reads.
+            # The manager passes now_ms so the clock is read once per frame,
+            # not once per light.
+            if not self._timer_armed:
+                if now_ms is None:
+                    now_ms = _now_ms()
+                if now_ms - self.cycle_start_ms >= self._period_ms:
+                    self._switch_light_phases()
+                    self.cycle_start_ms = now_ms
         elif mode == 'smart':
             pass
     
-    def _switch_light_phases(self):
-        if not self.cycle_order: return
-        current_green_road = self.cycle_order[self.current_green_index]
-        self.light_states[current_green_road] = LightState.RED
-        self.current_green_index = (self.current_green_index + 1) % len(self.cycle_order)
-        next_green_road = self.cycle_order[self.current_green_index]
-        self.light_states[next_green_road] = LightState.GREEN
+    def _switch_light_phases(self) -> None:
+        if self._phase_iter is None: return
+        red_road, green_road = next(self._phase_iter)
+        self.green_mask = DIR_BITS[green_road]
+        self.current_green_road = green_road
 
     # --- CLEANUP: Removed old angle-based functions for clarity ---
     def is_red_light(self, road_name: str) -> bool:
         """The one simple, reliable way to check the light status."""
-        return self.light_states.get(road_name) == LightState.RED
-    
-    def get_current_green_direction(self):
+        bit = DIR_BITS.get(road_name, 0)
+        return bool(self._active_mask & bit) and not (self.green_mask & bit)
+
+    def is_green_light(self, road_name: str) -> bool:
+        """Green-side counterpart of is_red_light"""
+        return bool(self.green_mask & DIR_BITS.get(road_name, 0))
+
+    # Bit-code variants for callers that resolved their DIR_BITS entry
+    # once up front (vehicles cache theirs at spawn)
+    def is_red_bit(self, bit: int) -> bool:
+        return bool(self._active_mask & bit) and not (self.green_mask & bit)
+
+    def is_green_bit(self, bit: int) -> bool:
+        return bool(self.green_mask & bit)
+
+    def get_current_green_direction(self) -> Optional[str]:
         """Get the name of the currently green direction"""
-        if self.cycle_order and 0 <= self.current_green_index < len(self.cycle_order):
-            return self.cycle_order[self.current_green_index]
-        return None
+        return self.current_green_road
     
-    def get_time_until_change(self):
+    def get_time_until_change(self) -> float:
         """Get remaining time in seconds until next light change"""
-        elapsed = time.time() - self.cycle_start_time
-        remaining = self.green_duration - elapsed
-        return max(0, remaining)
+        remaining_ms = self._period_ms - (_now_ms() - self.cycle_start_ms)
+        return max(0, remaining_ms) / 1000.0
     
-    def get_timer_info(self):
+    def get_timer_info(self) -> dict:
         """Get comprehensive timer information for display"""
         current_green = self.get_current_green_direction()
         time_remaining = self.get_time_until_change()
@@ -130,43 +318,126 @@ class TrafficLight:
             'cycle_progress': 1.0 - (time_remaining / self.green_duration) if self.green_duration > 0 else 0
         }
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, (80, 80, 80), (self.center_x, self.center_y), self.light_radius)
-        for name, direction in self.road_directions.items():
-            if name in self.light_states:
-                color = self.colors[self.light_states[name]]
-                angle_rad = math.radians(direction.angle)
-                x = self.center_x + (self.light_radius - 5) * math.cos(angle_rad)
-                y = self.center_y + (self.light_radius - 5) * math.sin(angle_rad)
-                pygame.draw.circle(screen, color, (int(x), int(y)), self.segment_width)
+    def collect_blits(self, out: list) -> None:
+        """Append this light's (surface, position) pairs for a batched blits"""
+        r = self.light_radius
+        sw = self.segment_width
+        out.append((self._bg_surf, (self.center_x - r, self.center_y - r)))
+        green_mask = self.green_mask
+        for direction, bit in zip(self._dirs, self._dir_bits):
+            out.append((self._segment_surfs[1 if green_mask & bit else 0],
+                        (int(self.center_x + direction.dx) - sw,
+                         int(self.center_y + direction.dy) - sw)))
+
+    def draw(self, screen: pygame.Surface) -> None:
+        blits = []
+        self.collect_blits(blits)
+        screen.blits(blits, doreturn=0)
 
 class TrafficLightManager:
     def __init__(self):
         self.traffic_lights: List[TrafficLight] = []
-        
-    def add_traffic_light(self, x, y, road_config, intersection_size=100):
+        self._green_masks = np.zeros(0, dtype=np.uint8)
+        # Uniform grid over light positions; sized to the default query
+        # radius so a 3x3 probe always covers it
+        self._cell_size = 300
+        self._grid: Dict[tuple, List[TrafficLight]] = {}
+        # SoA mirror of light centers for the vectorized full-scan path
+        self._cx = np.empty(0, dtype=np.float32)
+        self._cy = np.empty(0, dtype=np.float32)
+        if _nearest_light_idx is not None:
+            # warm the JIT off the hot path so the first real query is fast
+            _nearest_light_idx(self._cx, self._cy, np.float32(0), np.float32(0), np.float32(1))
+
+    def add_traffic_light(self, x: float, y: float, road_config: dict,
+                          intersection_size: int = 100) -> TrafficLight:
         light = TrafficLight(x, y, road_config, intersection_size)
+        # Small dense id: vehicles track passed lights as a bitmask
+        light.light_id = len(self.traffic_lights)
         self.traffic_lights.append(light)
+        self._green_masks = np.array([l.green_mask for l in self.traffic_lights], dtype=np.uint8)
+        key = (int(x) // self._cell_size, int(y) // self._cell_size)
+        self._grid.setdefault(key, []).append(light)
+        self._cx = np.append(self._cx, np.float32(x)).astype(np.float32, copy=False)
+        self._cy = np.append(self._cy, np.float32(y)).astype(np.float32, copy=False)
         return light
-        
-    def update_all(self):
-        for light in self.traffic_lights:
-            light.update_timing()
-            
-    def draw_all(self, screen):
+
+    def update_all(self) -> None:
+        # All lights share one clock sample per frame; each light then does
+        # at most an int compare before the mask refresh
+        now_ms = _now_ms()
+        masks = self._green_masks
+        for i, light in enumerate(self.traffic_lights):
+            light.update_timing(now_ms)
+            masks[i] = light.green_mask
+
+    def handle_event(self, event) -> bool:
+        """Route SDL phase-timer events from the main event loop to their light"""
+        return TrafficLight.handle_event(event)
+
+    def are_red(self, light_indices: np.ndarray, dir_bits: np.ndarray) -> np.ndarray:
+        """Batch form of TrafficLight.is_red_light.
+
+        Takes an array of light indices (positions in self.traffic_lights) and
+        the matching DIR_BITS values, and answers them all in one vectorized
+        pass instead of one Python call per vehicle.
+        """
+        return (self._green_masks[light_indices] & dir_bits) == 0
+
+    def draw_all(self, screen: pygame.Surface) -> None:
+        # One C-side blits call for every housing and segment of every
+        # light, instead of several blit crossings per light
+        blits = []
         for light in self.traffic_lights:
-            light.draw(screen)
+            light.collect_blits(blits)
+        if blits:
+            screen.blits(blits, doreturn=0)
             
-    def get_nearest_traffic_light(self, x, y, max_distance=300) -> Optional[TrafficLight]:
+    def get_nearest_traffic_light(self, x: float, y: float, max_distance: float = 300) -> Optional[TrafficLight]:
+        # Probe only the 3x3 grid neighborhood around the query when the
+        # radius fits in a cell; larger radii fall back to the full list
+        if max_distance <= self._cell_size:
+            cell = self._cell_size
+            gx, gy = int(x) // cell, int(y) // cell
+            grid = self._grid
+            candidates = [light
+                          for kx in (gx - 1, gx, gx + 1)
+                          for ky in (gy - 1, gy, gy + 1)
+                          for light in grid.get((kx, ky), ())]
+        else:
+            # Wide-radius query: one SIMD-friendly pass over the SoA center
+            # arrays beats attribute-by-attribute Python iteration
+            if not self.traffic_lights:
+                return None
+            if _nearest_light_idx is not None:
+                i = _nearest_light_idx(self._cx, self._cy, np.float32(x), np.float32(y),
+                                       np.float32(max_distance * max_distance))
+                return self.traffic_lights[i] if i >= 0 else None
+            dx = self._cx - np.float32(x)
+            dy = self._cy - np.float32(y)
+            d2 = dx * dx + dy * dy
+            i = int(np.argmin(d2))
+            return self.traffic_lights[i] if d2[i] <= max_distance * max_distance else None
+
+        # Cheap axis-aligned box test first, then squared distance: most
+        # lights are nowhere near the query, so skip the multiplies for them
+        # and never pay for a sqrt at all
         nearest = None
-        min_dist = float('inf')
-        for light in self.traffic_lights:
-            dist = math.hypot(light.center_x - x, light.center_y - y)
-            if dist < min_dist:
-                min_dist = dist
+        best_d2 = max_distance * max_distance
+        for light in candidates:
+            dx = light.center_x - x
+            if dx > max_distance or -dx > max_distance:
+                continue
+            dy = light.center_y - y
+            if dy > max_distance or -dy > max_distance:
+                continue
+            d2 = dx * dx + dy * dy
+            if d2 <= best_d2:
+                best_d2 = d2
                 nearest = light
-        return nearest if min_dist <= max_distance else None
+        return nearest
     
-    def update_road_config(self, new_road_config):
+    def update_road_config(self, new_road_config: dict) -> None:
+        fingerprint = _config_fingerprint(new_road_config)
         for light in self.traffic_lights:
-            light.update_road_config(new_road_config)
+            light.update_road_config(new_road_config, fingerprint)
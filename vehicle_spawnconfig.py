@@ -2,10 +2,18 @@
 
 import pygame
 import math
-import random
-from abc import ABC, abstractmethod
+import numpy as np
+from array import array
+
+# Optional: with numba installed the movement kernel below compiles to
+# native code; the NumPy fallback keeps the dependency soft
+try:
+    import numba
+except ImportError:
+    numba = None
+from abc import ABC
 from enum import Enum
-from traffic_lights import TrafficLightManager, LightState
+from traffic_lights import TrafficLightManager, LightState, DIR_BITS
 
 class VehicleType(Enum):
     BIKE = "bike"
@@ -20,6 +28,52 @@ class Direction(Enum):
     RIGHT = "right"
     U_TURN = "u_turn"
 
+class _RandPool:
+    """Uniform draws served from a pre-filled NumPy buffer.
+
+    One C-level refill every 64k draws amortizes the generator cost that
+    random.random()/random.uniform() pay on every Python call.
+    """
+    def __init__(self, size=65536):
+        self._rng = np.random.default_rng()
+        self._pool = self._rng.random(size)
+        self._idx = 0
+
+    def random(self):
+        i = self._idx
+        pool = self._pool
+        if i == len(pool):
+            self._pool = pool = self._rng.random(len(pool))
+            i = 0
+        self._idx = i + 1
+        return float(pool[i])
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+rand_pool = _RandPool()
+
+# Unit vectors for the four cardinal lane headings used by LaneManager.
+# Vehicles on straight lanes hit this table instead of trig.
+_CARDINAL_VEC = {0: (1.0, 0.0), 90: (0.0, 1.0), 180: (-1.0, 0.0), 270: (0.0, -1.0)}
+
+# 8-bit -> 16-bit interleave table for Morton (Z-order) keys
+_MORTON_SPREAD = tuple(
+    sum(((i >> b) & 1) << (2 * b) for b in range(8)) for i in range(256)
+)
+
+def _morton_key(v):
+    """Z-order key of a vehicle's 8 px cell; interleaving x/y bits keeps
+    spatially close vehicles adjacent when the list is sorted by it"""
+    x = max(0, int(v.x)) >> 3
+    y = max(0, int(v.y)) >> 3
+    t = _MORTON_SPREAD
+    return (t[x & 255] | (t[(x >> 8) & 255] << 16)
+            | (t[y & 255] | (t[(y >> 8) & 255] << 16)) << 1)
+
 class Lane:
     def __init__(self, center_x, center_y, width, direction_angle, lane_number, road_side):
         self.center_x = center_x
@@ -30,6 +84,21 @@ class Lane:
         self.road_side = road_side
 
 class VehicleBase(ABC):
+    __slots__ = ('x', 'y', '_angle', '_dx', '_dy', 'original_angle', 'lane', 'destination',
+                 'road_side', 'road_bit', 'speed', 'target_speed', 'max_speed',
+                 'acceleration', 'deceleration', 'width', 'length', 'color',
+                 'at_intersection', 'passed_lights', '_cached_light', '_tick',
+                 '_stopped_frames', '_half_len', '_half_wid')
+
+    # Per-type constants; subclasses override these instead of paying a
+    # method call per field at construction time
+    SPEED_RANGE = (0.0, 0.0)
+    ACCELERATION = 0.0
+    DECELERATION = 0.0
+    WIDTH = 0
+    LENGTH = 0
+    COLOR = (255, 255, 255)
+
     def __init__(self, x, y, angle, lane, destination):
         self.x = x
         self.y = y
@@ -38,36 +107,62 @@ class VehicleBase(ABC):
         self.lane = lane
         self.destination = destination
         self.road_side = lane.road_side if lane else None
+        # Direction resolved to its DIR_BITS code once; the per-frame
+        # light checks then work on a plain int instead of a string key
+        self.road_bit = DIR_BITS.get(self.road_side, 0)
 
         self.speed = 0.0
-        self.target_speed = random.uniform(0.8, 1.1) * self.get_max_speed()
-        self.max_speed = self.get_max_speed()
-        self.acceleration = self.get_acceleration()
-        self.deceleration = self.get_deceleration()
-        
-        self.width = self.get_width()
-        self.length = self.get_length()
-        self.color = self.get_color()
-        
+        lo, hi = self.SPEED_RANGE
+        self.max_speed = rand_pool.uniform(lo, hi)
+        self.target_speed = rand_pool.uniform(0.8, 1.1) * self.max_speed
+        self.acceleration = self.ACCELERATION
+        self.deceleration = self.DECELERATION
+
+        self.width = self.WIDTH
+        self.length = self.LENGTH
+        self.color = self.COLOR
+        # Folded once; the pairwise checks below combine other._half_*
+        # instead of redoing the arithmetic per pair
+        self._half_len = self.LENGTH * 0.5
+        self._half_wid = self.WIDTH * 0.5
+
         self.at_intersection = False
-        self.passed_lights = set()  # Track which traffic lights this vehicle has passed
-
-    @abstractmethod
-    def get_max_speed(self): pass
-    @abstractmethod
-    def get_acceleration(self): pass
-    @abstractmethod
-    def get_deceleration(self): pass
-    @abstractmethod
-    def get_width(self): pass
-    @abstractmethod
-    def get_length(self): pass
-    @abstractmethod
-    def get_color(self): pass
-
-    def is_in_intersection(self, intersection_bounds):
-        return (intersection_bounds['left'] <= self.x <= intersection_bounds['right'] and
-                intersection_bounds['top'] <= self.y <= intersection_bounds['bottom'])
+        self.passed_lights = 0  # Bitmask over light_id of legally passed lights
+        self._cached_light = None  # Nearest light memo for compliance checks
+        # Staggered phase so the throttled housekeeping below doesn't hit
+        # every vehicle on the same frame
+        self._tick = int(rand_pool.random() * 30)
+        self._stopped_frames = 0  # Consecutive frames entered with speed 0
+
+    def get_max_speed(self): return rand_pool.uniform(*self.SPEED_RANGE)
+    def get_acceleration(self): return self.ACCELERATION
+    def get_deceleration(self): return self.DECELERATION
+    def get_width(self): return self.WIDTH
+    def get_length(self): return self.LENGTH
+    def get_color(self): return self.COLOR
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, value):
+        # Heading vector is refreshed here so the per-frame movement and
+        # lookahead code reads _dx/_dy without any trig or table lookup
+        self._angle = value
+        # Float keys hash-match the int table entries (90.0 hits, 90.5
+        # misses), so only exact cardinals take the table path
+        vec = _CARDINAL_VEC.get(value % 360)
+        if vec is None:
+            rad = math.radians(value)
+            vec = (math.cos(rad), math.sin(rad))
+        self._dx, self._dy = vec
+
+    def is_in_intersection(self, ibounds):
+        # ibounds is the (left, top, right, bottom) tuple kept by
+        # LaneManager; plain scalar compares, no dict hashing per vehicle
+        x, y = self.x, self.y
+        return ibounds[0] <= x <= ibounds[2] and ibounds[1] <= y <= ibounds[3]
 
     def check_for_overlap(self, other_vehicle):
         """Check if this vehicle is overlapping with another vehicle"""
@@ -75,82 +170,98 @@ class VehicleBase(ABC):
         dy = abs(self.y - other_vehicle.y)
         
         # Calculate minimum safe distances based on vehicle dimensions (tighter)
-        min_x_distance = (self.length + other_vehicle.length) / 2 + 1  # Very small buffer
-        min_y_distance = (self.width + other_vehicle.width) / 2 + 1   # Very small buffer
+        min_x_distance = self._half_len + other_vehicle._half_len + 1  # Very small buffer
+        min_y_distance = self._half_wid + other_vehicle._half_wid + 1  # Very small buffer
         
         # Check if vehicles are overlapping
         return dx < min_x_distance and dy < min_y_distance
 
     def update_position(self, dt):
-        angle_rad = math.radians(self.angle)
-        self.x += self.speed * math.cos(angle_rad) * dt * 60
-        self.y += self.speed * math.sin(angle_rad) * dt * 60
+        movement = self.speed * dt * 60
+        self.x += self._dx * movement
+        self.y += self._dy * movement
 
     def check_traffic_light_compliance(self, traffic_light_manager):
-        if not self.road_side:
+        if not self.road_bit:
             return "proceed"
 
-        nearest_light = traffic_light_manager.get_nearest_traffic_light(self.x, self.y)
-        if not nearest_light:
-            return "proceed"
+        # A vehicle keeps approaching the same light for its whole run,
+        # so the manager lookup is memoized until the light falls out of
+        # relevance range (beyond which compliance is 'proceed' anyway)
+        nearest_light = self._cached_light
+        if nearest_light is not None:
+            ddx = self.x - nearest_light.center_x
+            ddy = self.y - nearest_light.center_y
+            d2_to_light = ddx * ddx + ddy * ddy
+            if d2_to_light > 300 * 300:
+                nearest_light = None
+        if nearest_light is None:
+            nearest_light = traffic_light_manager.get_nearest_traffic_light(self.x, self.y)
+            self._cached_light = nearest_light
+            if not nearest_light:
+                return "proceed"
+            ddx = self.x - nearest_light.center_x
+            ddy = self.y - nearest_light.center_y
+            d2_to_light = ddx * ddx + ddy * ddy
+
+        light_bit = 1 << nearest_light.light_id
 
-        # Create a unique identifier for this traffic light
-        light_id = (nearest_light.center_x, nearest_light.center_y)
-        
-        dist_to_light = math.hypot(self.x - nearest_light.center_x, self.y - nearest_light.center_y)
-        
         # If vehicle is very close to or past the intersection center, mark as passed
-        if dist_to_light <= 60:  # Close to intersection center
-            if light_id not in self.passed_lights:
+        if d2_to_light <= 60 * 60:  # Close to intersection center
+            if not self.passed_lights & light_bit:
                 # Vehicle is crossing the intersection - check if it was green when approaching
-                if nearest_light.is_green_light(self.road_side):
-                    self.passed_lights.add(light_id)  # Mark as legally passed
+                if nearest_light.is_green_bit(self.road_bit):
+                    self.passed_lights |= light_bit  # Mark as legally passed
                     return "proceed"
                 # If it's red and we haven't marked it as passed, we should stop
-                elif nearest_light.is_red_light(self.road_side):
+                elif nearest_light.is_red_bit(self.road_bit):
                     return "stop"
             else:
                 # Already passed this light when it was green, continue regardless of current state
                 return "proceed"
         
         # Vehicle is approaching the intersection
-        elif dist_to_light <= 120:  # Within stopping distance
-            if light_id in self.passed_lights:
+        elif d2_to_light <= 120 * 120:  # Within stopping distance
+            if self.passed_lights & light_bit:
                 # This shouldn't happen (vehicle moving backwards), but handle it
                 return "proceed"
             
-            if nearest_light.is_red_light(self.road_side):
+            if nearest_light.is_red_bit(self.road_bit):
                 return "stop"
         
         # Vehicle is far from intersection or has passed through
         return "proceed"
 
     def cleanup_passed_lights(self, traffic_light_manager):
-        """Remove traffic light IDs that are far away to prevent memory buildup"""
-        if not self.passed_lights:
+        """Clear bits for lights that are far away so the mask can't go stale"""
+        mask = self.passed_lights
+        if not mask:
             return
-            
-        lights_to_remove = []
-        for light_id in self.passed_lights:
-            light_x, light_y = light_id
-            dist = math.hypot(self.x - light_x, self.y - light_y)
-            # If vehicle is more than 300 pixels away from a passed light, remove it
-            if dist > 300:
-                lights_to_remove.append(light_id)
-        
-        for light_id in lights_to_remove:
-            self.passed_lights.remove(light_id)
+
+        x, y = self.x, self.y
+        lights = traffic_light_manager.traffic_lights
+        pending = mask
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            light = lights[bit.bit_length() - 1]
+            dx = x - light.center_x
+            dy = y - light.center_y
+            # If vehicle is more than 300 pixels away from a passed light, drop it
+            if dx * dx + dy * dy > 300 * 300:
+                mask ^= bit
+        self.passed_lights = mask
 
     def get_vehicle_ahead(self, all_vehicles, max_distance=200):
         closest_vehicle = None
         min_distance = max_distance
+        max_d2 = max_distance * max_distance
         
-        angle_rad = math.radians(self.angle)
-        our_dx, our_dy = math.cos(angle_rad), math.sin(angle_rad)
+        our_dx, our_dy = self._dx, self._dy
         
         # Calculate our front position
-        front_x = self.x + (self.length / 2) * our_dx
-        front_y = self.y + (self.length / 2) * our_dy
+        front_x = self.x + self._half_len * our_dx
+        front_y = self.y + self._half_len * our_dy
         
         for vehicle in all_vehicles:
             if vehicle == self: continue
@@ -158,31 +269,42 @@ class VehicleBase(ABC):
             # Vector from our front to the other vehicle's center
             dx = vehicle.x - front_x
             dy = vehicle.y - front_y
-            distance = math.hypot(dx, dy)
+            # Squared distance for the range gate; sqrt is deferred until a
+            # candidate survives the in-lane checks below
+            d2 = dx * dx + dy * dy
             
-            if distance < max_distance:
+            if d2 < max_d2:
                 # Check if the vehicle is in front of us (dot product > 0)
                 dot_product = dx * our_dx + dy * our_dy
                 
                 # More strict lane checking - vehicles must be very close to our path
                 # Cross product gives perpendicular distance
                 cross_product = abs(dx * our_dy - dy * our_dx)
-                lane_tolerance = (max(self.width, vehicle.width) / 2) + 8  # Tighter lane tolerance
-                
-                # Also check for potential overlap by considering vehicle sizes
-                vehicle_front_x = vehicle.x - (vehicle.length / 2) * math.cos(math.radians(vehicle.angle))
-                vehicle_front_y = vehicle.y - (vehicle.length / 2) * math.sin(math.radians(vehicle.angle))
-                vehicle_back_x = vehicle.x + (vehicle.length / 2) * math.cos(math.radians(vehicle.angle))
-                vehicle_back_y = vehicle.y + (vehicle.length / 2) * math.sin(math.radians(vehicle.angle))
+                lane_tolerance = max(self._half_wid, vehicle._half_wid) + 8  # Tighter lane tolerance
                 
-                # Check distance to both front and back of the other vehicle
-                dist_to_front = math.hypot(vehicle_front_x - front_x, vehicle_front_y - front_y)
-                dist_to_back = math.hypot(vehicle_back_x - front_x, vehicle_back_y - front_y)
-                actual_distance = min(distance, dist_to_front, dist_to_back)
-                
-                if dot_product > -20 and cross_product < lane_tolerance and actual_distance < min_distance:
-                    min_distance = actual_distance
-                    closest_vehicle = vehicle
+                if dot_product > -20 and cross_product < lane_tolerance:
+                    # Also check for potential overlap by considering vehicle sizes
+                    other_dx, other_dy = vehicle._dx, vehicle._dy
+                    half_len = vehicle._half_len
+                    fx = vehicle.x - half_len * other_dx - front_x
+                    fy = vehicle.y - half_len * other_dy - front_y
+                    bx = vehicle.x + half_len * other_dx - front_x
+                    by = vehicle.y + half_len * other_dy - front_y
+                    
+                    # Nearest of center/front/back, one sqrt for the winner
+                    actual_d2 = min(d2, fx * fx + fy * fy, bx * bx + by * by)
+                    actual_distance = math.sqrt(actual_d2)
+                    
+                    if actual_distance < min_distance:
+                        min_distance = actual_distance
+                        closest_vehicle = vehicle
+                        # Stop scanning only once the leader is inside the
+                        # emergency zone of *any* candidate: optimal following
+                        # distance is at least our half-length plus the other
+                        # half-length (>= 8, a Bike) plus 5, and the emergency
+                        # band starts 10 below that
+                        if min_distance < self._half_len + 8 + 5 - 10:
+                            break
         
         return closest_vehicle, min_distance
 
@@ -209,30 +331,53 @@ class VehicleBase(ABC):
         
         return base_distance + stopping_distance + speed_buffer
 
-    def update_behavior(self, vehicles, intersection_bounds, dt, traffic_light_manager=None):
-        self.at_intersection = self.is_in_intersection(intersection_bounds)
+    def update_behavior(self, vehicles, intersection_bounds, dt, traffic_light_manager=None, ahead=None, overlapping=None, at_intersection=None):
+        if at_intersection is None:
+            at_intersection = self.is_in_intersection(intersection_bounds)
+        self.at_intersection = at_intersection
 
-        # Clean up old passed traffic light records
+        # Clean up old passed traffic light records. A vehicle moves a few
+        # pixels per frame, so checking every 30th frame loses nothing
         if traffic_light_manager:
-            self.cleanup_passed_lights(traffic_light_manager)
+            self._tick += 1
+            if self._tick >= 30:
+                self._tick = 0
+                self.cleanup_passed_lights(traffic_light_manager)
+
+        # Fast path for queued vehicles: once stopped for a few frames at
+        # a red light, only the light itself can change anything, so the
+        # overlap and leader scans are skipped until it releases us
+        if self.speed == 0:
+            self._stopped_frames += 1
+        else:
+            self._stopped_frames = 0
+        if self._stopped_frames > 3 and traffic_light_manager is not None:
+            if self.check_traffic_light_compliance(traffic_light_manager) == "stop":
+                return
 
         # EMERGENCY CHECK: Stop immediately if overlapping with any vehicle
-        for vehicle in vehicles:
-            if vehicle != self and self.check_for_overlap(vehicle):
-                self.speed = 0  # Full stop if overlapping
-                self.update_position(dt)
-                return
+        if overlapping is None:
+            overlapping = False
+            for vehicle in vehicles:
+                if vehicle != self and self.check_for_overlap(vehicle):
+                    overlapping = True
+                    break
+        if overlapping:
+            self.speed = 0  # Full stop if overlapping
+            return
 
         # Check traffic lights first
         if traffic_light_manager:
             action = self.check_traffic_light_compliance(traffic_light_manager)
             if action == "stop":
                 self.speed = max(0, self.speed - self.deceleration * dt * 3)
-                self.update_position(dt)
                 return
 
         # Enhanced collision detection and avoidance with precise distance control
-        vehicle_ahead, distance = self.get_vehicle_ahead(vehicles)
+        if ahead is not None:
+            vehicle_ahead, distance = ahead
+        else:
+            vehicle_ahead, distance = self.get_vehicle_ahead(vehicles)
         
         if vehicle_ahead:
             # Calculate optimal following distance
@@ -275,24 +420,32 @@ class VehicleBase(ABC):
             if self.speed < self.target_speed:
                 self.speed = min(self.target_speed, self.speed + self.acceleration * dt)
 
-        self.update_position(dt)
+    # Rotated body sprites shared per (class, 5-degree angle bucket);
+    # size and color are fixed per class, so the cache stays tiny
+    _sprite_cache = {}
+
+    def get_sprite(self):
+        bucket = int(self.angle // 5) % 72
+        key = (self.__class__, bucket)
+        sprite = VehicleBase._sprite_cache.get(key)
+        if sprite is None:
+            base = pygame.Surface((self.length, self.width), pygame.SRCALPHA)
+            body = base.get_rect()
+            pygame.draw.rect(base, self.color, body)
+            pygame.draw.rect(base, (0, 0, 0), body, 1)
+            # negative: pygame rotates CCW, screen angles here grow CW
+            sprite = pygame.transform.rotate(base, -bucket * 5)
+            VehicleBase._sprite_cache[key] = sprite
+        return sprite
 
     def draw(self, screen):
-        angle_rad = math.radians(self.angle)
-        half_len, half_wid = self.length / 2, self.width / 2
-        corners = [(-half_len, -half_wid), (half_len, -half_wid), (half_len, half_wid), (-half_len, half_wid)]
-        rotated_corners = []
-        for x, y in corners:
-            rx = x * math.cos(angle_rad) - y * math.sin(angle_rad) + self.x
-            ry = x * math.sin(angle_rad) + y * math.cos(angle_rad) + self.y
-            rotated_corners.append((rx, ry))
-        pygame.draw.polygon(screen, self.color, rotated_corners)
-        pygame.draw.polygon(screen, (0,0,0), rotated_corners, 1)
+        sprite = self.get_sprite()
+        screen.blit(sprite, (self.x - sprite.get_width() / 2,
+                             self.y - sprite.get_height() / 2))
 
     def draw_collision_zones(self, screen, vehicle_ahead=None):
         """Draw collision detection zones for debugging"""
-        angle_rad = math.radians(self.angle)
-        dx, dy = math.cos(angle_rad), math.sin(angle_rad)
+        dx, dy = self._dx, self._dy
         
         # Calculate zones based on optimal following distance if vehicle ahead exists
         if vehicle_ahead:
@@ -336,50 +489,56 @@ class VehicleBase(ABC):
 
 
 class Bike(VehicleBase):
-    def get_max_speed(self): return random.uniform(4.0, 5.0)
-    def get_acceleration(self): return 0.20
-    def get_deceleration(self): return 0.80  # Increased from 0.50
-    def get_width(self): return 8
-    def get_length(self): return 16
-    def get_color(self): return (200, 200, 200)
+    __slots__ = ()
+    SPEED_RANGE = (4.0, 5.0)
+    ACCELERATION = 0.20
+    DECELERATION = 0.80  # Increased from 0.50
+    WIDTH = 8
+    LENGTH = 16
+    COLOR = (200, 200, 200)
 
 class Car(VehicleBase):
-    def get_max_speed(self): return random.uniform(3.0, 4.0)
-    def get_acceleration(self): return 0.15
-    def get_deceleration(self): return 0.70  # Increased from 0.40
-    def get_width(self): return 18
-    def get_length(self): return 35
-    def get_color(self): return (100, 100, 255)
+    __slots__ = ()
+    SPEED_RANGE = (3.0, 4.0)
+    ACCELERATION = 0.15
+    DECELERATION = 0.70  # Increased from 0.40
+    WIDTH = 18
+    LENGTH = 35
+    COLOR = (100, 100, 255)
 
 class Auto(VehicleBase):
-    def get_max_speed(self): return random.uniform(2.0, 3.0)
-    def get_acceleration(self): return 0.12
-    def get_deceleration(self): return 0.60  # Increased from 0.35
-    def get_width(self): return 12
-    def get_length(self): return 22
-    def get_color(self): return (255, 255, 0)
+    __slots__ = ()
+    SPEED_RANGE = (2.0, 3.0)
+    ACCELERATION = 0.12
+    DECELERATION = 0.60  # Increased from 0.35
+    WIDTH = 12
+    LENGTH = 22
+    COLOR = (255, 255, 0)
 
 class Bus(VehicleBase):
-    def get_max_speed(self): return random.uniform(1.5, 2.5)
-    def get_acceleration(self): return 0.08
-    def get_deceleration(self): return 0.50  # Increased from 0.25
-    def get_width(self): return 25
-    def get_length(self): return 65
-    def get_color(self): return (255, 165, 0)
+    __slots__ = ()
+    SPEED_RANGE = (1.5, 2.5)
+    ACCELERATION = 0.08
+    DECELERATION = 0.50  # Increased from 0.25
+    WIDTH = 25
+    LENGTH = 65
+    COLOR = (255, 165, 0)
 
 class Truck(VehicleBase):
-    def get_max_speed(self): return random.uniform(1.8, 2.8)
-    def get_acceleration(self): return 0.10
-    def get_deceleration(self): return 0.55  # Increased from 0.30
-    def get_width(self): return 22
-    def get_length(self): return 55
-    def get_color(self): return (150, 150, 150)
+    __slots__ = ()
+    SPEED_RANGE = (1.8, 2.8)
+    ACCELERATION = 0.10
+    DECELERATION = 0.55  # Increased from 0.30
+    WIDTH = 22
+    LENGTH = 55
+    COLOR = (150, 150, 150)
 
 
 class LaneManager:
     def __init__(self):
         self.lanes = []
         self.intersection_bounds = {'left': 0, 'right': 0, 'top': 0, 'bottom': 0}
+        self.ibounds = (0, 0, 0, 0)
 
     def setup_lanes(self, road_config, center_x=960, center_y=540):
         self.lanes = []
@@ -392,6 +551,9 @@ class LaneManager:
             'left': center_x - intersection_half, 'right': center_x + intersection_half,
             'top': center_y - intersection_half, 'bottom': center_y + intersection_half
         }
+        # Same extents as a flat tuple for the per-vehicle hot path
+        self.ibounds = (center_x - intersection_half, center_y - intersection_half,
+                        center_x + intersection_half, center_y + intersection_half)
         
         if road_config['junction_type'] == 'cross':
             self._setup_cross_lanes(road_config, center_x, center_y, lane_width, total_lanes)
@@ -423,8 +585,42 @@ class LaneManager:
     def get_spawn_lanes(self):
         return self.lanes
     
+    _DESTINATIONS = tuple(Direction)
+
     def get_random_destination(self, current_lane):
-        return random.choice(list(Direction))
+        return rand_pool.choice(LaneManager._DESTINATIONS)
+
+class AliasSampler:
+    """O(1) categorical sampling via Vose's alias method.
+
+    Built once per distribution; each draw costs two random() calls and one
+    table lookup, instead of the O(n) cumulative scan random.choices does.
+    """
+    def __init__(self, distribution):
+        items = list(distribution.items())
+        total = sum(weight for _, weight in items)
+        self.outcomes = [outcome for outcome, _ in items]
+        n = len(items)
+        self.n = n
+        self.prob = array('d', [0.0] * n)
+        self.alias = array('i', [0] * n)
+
+        scaled = [weight * n / total for _, weight in items]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self):
+        i = int(rand_pool.random() * self.n)
+        return self.outcomes[i] if rand_pool.random() < self.prob[i] else self.outcomes[self.alias[i]]
 
 class VehicleFactory:
     VEHICLE_CLASSES = {
@@ -436,86 +632,370 @@ class VehicleFactory:
     def create_vehicle(cls, vehicle_type, x, y, angle, lane, destination):
         return cls.VEHICLE_CLASSES[vehicle_type](x, y, angle, lane, destination)
     
+    _sampler_cache = {}
+
+    @classmethod
+    def sampler_for(cls, distribution):
+        """Shared AliasSampler for a distribution; callers with a stable
+        distribution should fetch this once rather than per spawn"""
+        key = tuple(distribution.items())
+        sampler = cls._sampler_cache.get(key)
+        if sampler is None:
+            sampler = AliasSampler(distribution)
+            cls._sampler_cache[key] = sampler
+        return sampler
+
     @classmethod
     def create_random_vehicle(cls, x, y, angle, lane, destination, distribution):
-        vehicle_type = random.choices(list(distribution.keys()), list(distribution.values()))[0]
-        return cls.create_vehicle(vehicle_type, x, y, angle, lane, destination)
+        sampler = cls.sampler_for(distribution)
+        return cls.create_vehicle(sampler.sample(), x, y, angle, lane, destination)
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _movement_deltas(speed, angle_deg, scale, out_dx, out_dy):
+        for i in range(speed.shape[0]):
+            rad = angle_deg[i] * 0.017453292519943295
+            out_dx[i] = speed[i] * math.cos(rad) * scale
+            out_dy[i] = speed[i] * math.sin(rad) * scale
+else:
+    def _movement_deltas(speed, angle_deg, scale, out_dx, out_dy):
+        rad = np.radians(angle_deg)
+        np.multiply(speed * scale, np.cos(rad), out=out_dx)
+        np.multiply(speed * scale, np.sin(rad), out=out_dy)
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _find_ahead_all(x, y, hx, hy, length, width, max_dist, out_idx, out_dist):
+        """Compiled all-pairs mirror of VehicleBase.get_vehicle_ahead.
+
+        For each vehicle i, writes the index of its closest in-lane
+        leader (or -1) and the distance into the out arrays. The pair
+        loop is O(N^2) but runs entirely in machine code.
+        """
+        n = x.shape[0]
+        max_d2 = max_dist * max_dist
+        for i in range(n):
+            fx = x[i] + 0.5 * length[i] * hx[i]
+            fy = y[i] + 0.5 * length[i] * hy[i]
+            best = -1
+            best_dist = max_dist
+            for j in range(n):
+                if j == i:
+                    continue
+                dx = x[j] - fx
+                dy = y[j] - fy
+                d2 = dx * dx + dy * dy
+                if d2 >= max_d2:
+                    continue
+                dot = dx * hx[i] + dy * hy[i]
+                cross = abs(dx * hy[i] - dy * hx[i])
+                tol = 0.5 * max(width[i], width[j]) + 8.0
+                if dot > -20.0 and cross < tol:
+                    half = 0.5 * length[j]
+                    ax = x[j] - half * hx[j] - fx
+                    ay = y[j] - half * hy[j] - fy
+                    bx = x[j] + half * hx[j] - fx
+                    by = y[j] + half * hy[j] - fy
+                    d2m = min(d2, ax * ax + ay * ay, bx * bx + by * by)
+                    dist = math.sqrt(d2m)
+                    if dist < best_dist:
+                        best_dist = dist
+                        best = j
+            out_idx[i] = best
+            out_dist[i] = best_dist
+else:
+    # Without numba the per-pair Python kernel would be slower than the
+    # grid-pruned get_vehicle_ahead path, so the object path stays
+    _find_ahead_all = None
+
+class VehicleArrays:
+    """Structure-of-arrays mirror of the live vehicle list.
+
+    The behavior code still works on VehicleBase objects, but per-frame
+    whole-population passes (culling, proximity, overlap) read these
+    contiguous float32 arrays instead of chasing object attributes.
+    Refreshed once per frame by VehicleSpawner.update_vehicles.
+    """
+    def __init__(self, capacity=128):
+        self.n = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.empty(capacity, dtype=np.float32)
+        self.y = np.empty(capacity, dtype=np.float32)
+        self.speed = np.empty(capacity, dtype=np.float32)
+        self.angle = np.empty(capacity, dtype=np.float32)
+        self.length = np.empty(capacity, dtype=np.float32)
+        self.width = np.empty(capacity, dtype=np.float32)
+        self.hx = np.empty(capacity, dtype=np.float32)
+        self.hy = np.empty(capacity, dtype=np.float32)
+
+    def refresh(self, vehicles):
+        n = len(vehicles)
+        if n > self.capacity:
+            capacity = self.capacity
+            while capacity < n:
+                capacity *= 2
+            self._allocate(capacity)
+        x, y = self.x, self.y
+        speed, angle = self.speed, self.angle
+        length, width = self.length, self.width
+        hx, hy = self.hx, self.hy
+        for i, v in enumerate(vehicles):
+            x[i] = v.x
+            y[i] = v.y
+            speed[i] = v.speed
+            angle[i] = v.angle
+            length[i] = v.length
+            width[i] = v.width
+            hx[i] = v._dx
+            hy[i] = v._dy
+        self.n = n
+
+    def in_bounds_mask(self, x_min, x_max, y_min, y_max):
+        n = self.n
+        x, y = self.x[:n], self.y[:n]
+        return (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+
+class SpatialGrid:
+    """Uniform hash grid over vehicle positions, rebuilt once per frame.
+
+    Sized so a 3x3 cell probe covers the longest detection range used by
+    the behavior code, turning the per-vehicle neighbor scan from
+    all-N-vehicles into just the local cluster.
+    """
+    def __init__(self, cell_size=200):
+        self.cell_size = cell_size
+        self._cells = {}
+
+    def rebuild(self, vehicles):
+        cells = self._cells
+        cells.clear()
+        cell = self.cell_size
+        for v in vehicles:
+            key = (int(v.x) // cell, int(v.y) // cell)
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = bucket = []
+            bucket.append(v)
+
+    def nearby(self, x, y):
+        """Vehicles in the 3x3 neighborhood of cells around (x, y)"""
+        cell = self.cell_size
+        cx, cy = int(x) // cell, int(y) // cell
+        cells = self._cells
+        out = []
+        for kx in (cx - 1, cx, cx + 1):
+            for ky in (cy - 1, cy, cy + 1):
+                bucket = cells.get((kx, ky))
+                if bucket:
+                    out.extend(bucket)
+        return out
 
 class VehicleSpawner:
     def __init__(self):
         self.vehicles = []
+        self.arrays = VehicleArrays()
+        self.neighbor_grid = SpatialGrid()
         self.lane_manager = LaneManager()
         self.spawn_interval = 0.8
         self.last_spawn_time = 0
         self.max_vehicles = 100
         self.spawning_enabled = False
+        # Cull rectangle: the 1920x1080 playfield plus margin, resolved
+        # once here instead of being re-spelled inside the frame loop
+        margin = 150
+        self._cull_bounds = (-margin, 1920 + margin, -margin, 1080 + margin)
+        self._frame = 0
         self.vehicle_distribution = {
             VehicleType.BIKE: 0.747, VehicleType.CAR: 0.136, VehicleType.TRUCK: 0.093,
             VehicleType.AUTO: 0.018, VehicleType.BUS: 0.006,
         }
-    
+        # Resolve the type sampler once; spawn_vehicle then skips the
+        # per-call dict->tuple key build in the factory
+        self._type_sampler = VehicleFactory.sampler_for(self.vehicle_distribution)
+        # Static debug overlay (lane dots + intersection bounds), rebuilt
+        # only when the road config changes
+        self._lane_debug_surf = None
+
     def set_road_config(self, road_config):
         self.lane_manager.setup_lanes(road_config)
+        self._lane_debug_surf = None
     
     def update_vehicles(self, dt, current_time, road_config, traffic_light_manager=None):
-        self.vehicles = [v for v in self.vehicles if -150 <= v.x <= 2070 and -150 <= v.y <= 1230]
-        
-        for vehicle in self.vehicles:
-            vehicle.update_behavior(self.vehicles, self.lane_manager.intersection_bounds, dt, traffic_light_manager)
-        
+        self._step(dt, traffic_light_manager)
+
         if self.spawning_enabled and (current_time - self.last_spawn_time > self.spawn_interval) and len(self.vehicles) < self.max_vehicles:
             self.spawn_vehicle(current_time)
             self.last_spawn_time = current_time
 
+    def _step(self, dt, traffic_light_manager):
+        """One fused simulation step: behavior, integration, culling.
+
+        Rather than walking the vehicle list once per concern, a single
+        pass decides speeds (via the spatial grid), a single batched
+        kernel integrates positions over the SoA arrays (Numba-jitted
+        when available), and the off-screen cull reuses the freshly
+        integrated coordinates, so the arrays are filled exactly once
+        per frame.
+        """
+        vehicles = self.vehicles
+        n = len(vehicles)
+        if not n:
+            # Still flush the grid: spawn_vehicle probes it, so stale
+            # buckets from a clear would gate spawning on phantoms
+            self.neighbor_grid.rebuild(vehicles)
+            return
+
+        # Periodic Z-order sort: spawn order scatters neighbors through
+        # memory, so re-sorting by Morton key keeps the grid buckets and
+        # array refresh streaming over nearby objects. Every 32 frames is
+        # plenty — locality degrades slowly at these speeds.
+        self._frame += 1
+        if self._frame & 31 == 0:
+            vehicles.sort(key=_morton_key)
+
+        # Hoist the per-frame invariants out of the vehicle loop: bounds and
+        # grid don't change mid-frame, so resolve them once, not per vehicle
+        grid = self.neighbor_grid
+        bounds = self.lane_manager.ibounds
+        grid.rebuild(vehicles)
+        arrays = self.arrays
+        arrays.refresh(vehicles)
+        overlap_any = self._overlap_mask(arrays, n)
+        # All containment tests in one 4-compare NumPy pass
+        ix0, iy0, ix1, iy1 = bounds
+        x_n, y_n = arrays.x[:n], arrays.y[:n]
+        in_int = (x_n >= ix0) & (x_n <= ix1) & (y_n >= iy0) & (y_n <= iy1)
+
+        if _find_ahead_all is not None and n > 1:
+            # Leader search for the whole population in one compiled
+            # pass; the behavior loop then skips get_vehicle_ahead
+            ahead_idx = np.empty(n, dtype=np.int32)
+            ahead_dist = np.empty(n, dtype=np.float32)
+            _find_ahead_all(arrays.x[:n], arrays.y[:n], arrays.hx[:n], arrays.hy[:n],
+                            arrays.length[:n], arrays.width[:n], np.float32(200.0),
+                            ahead_idx, ahead_dist)
+            for i, vehicle in enumerate(vehicles):
+                j = ahead_idx[i]
+                ahead = (vehicles[j] if j >= 0 else None, float(ahead_dist[i]))
+                # ahead/overlap/intersection are all precomputed, so the
+                # vehicles argument is never scanned — no grid probe here
+                vehicle.update_behavior(vehicles, bounds, dt, traffic_light_manager,
+                                        ahead, bool(overlap_any[i]), bool(in_int[i]))
+        else:
+            for i, vehicle in enumerate(vehicles):
+                nearby = grid.nearby(vehicle.x, vehicle.y)
+                # Isolated vehicle: its 3x3 neighborhood holds only
+                # itself, so there is no leader to scan for
+                ahead = (None, 200.0) if len(nearby) <= 1 else None
+                vehicle.update_behavior(nearby, bounds, dt, traffic_light_manager,
+                                        ahead, bool(overlap_any[i]), bool(in_int[i]))
+
+        # Behavior only rewrites speeds, so just that column is refilled
+        # before integration
+        speed = arrays.speed
+        for i, v in enumerate(vehicles):
+            speed[i] = v.speed
+        dx = np.empty(n, dtype=np.float32)
+        dy = np.empty(n, dtype=np.float32)
+        _movement_deltas(speed[:n], arrays.angle[:n], np.float32(dt * 60), dx, dy)
+        x, y = arrays.x, arrays.y
+        x[:n] += dx
+        y[:n] += dy
+        # float() keeps vehicle coordinates plain Python floats for pygame
+        for i, v in enumerate(vehicles):
+            v.x = float(x[i])
+            v.y = float(y[i])
+
+        keep = arrays.in_bounds_mask(*self._cull_bounds)
+        if not keep.all():
+            # Swap-pop each offender with the tail: O(1) per removal and
+            # no full list rebuild. Descending order keeps pending
+            # removal indices valid; vehicle order doesn't matter.
+            for i in np.flatnonzero(~keep)[::-1]:
+                vehicles[i] = vehicles[-1]
+                vehicles.pop()
+
+    @staticmethod
+    def _overlap_mask(arrays, n):
+        """Per-vehicle 'touching anyone' flags in one broadcasted pass.
+
+        Mirrors VehicleBase.check_for_overlap over the SoA arrays: an
+        NxN compare against the pairwise size envelopes, diagonal
+        cleared, reduced with any() along each row.
+        """
+        x, y = arrays.x[:n], arrays.y[:n]
+        length, width = arrays.length[:n], arrays.width[:n]
+        dx = np.abs(x[:, None] - x[None, :])
+        dy = np.abs(y[:, None] - y[None, :])
+        min_x = (length[:, None] + length[None, :]) * 0.5 + 1
+        min_y = (width[:, None] + width[None, :]) * 0.5 + 1
+        overlap = (dx < min_x) & (dy < min_y)
+        np.fill_diagonal(overlap, False)
+        return overlap.any(axis=1)
+
     def spawn_vehicle(self, current_time):
         spawn_lanes = self.lane_manager.get_spawn_lanes()
         if not spawn_lanes: return
         
-        spawn_lane = random.choice(spawn_lanes)
+        spawn_lane = rand_pool.choice(spawn_lanes)
         spawn_x, spawn_y = spawn_lane.center_x, spawn_lane.center_y
         
-        # Much stricter spawn checking to prevent overlaps
-        min_spawn_distance = 120  # Increased minimum distance
-        for v in self.vehicles:
-            distance = math.hypot(v.x - spawn_x, v.y - spawn_y)
-            if distance < min_spawn_distance:
+        # Much stricter spawn checking to prevent overlaps. Only the 3x3
+        # grid cells around the spawn point are scanned — every threshold
+        # below fits inside the grid's 200 px cell radius — and all
+        # thresholds compare squared distances so no sqrt is paid.
+        for v in self.neighbor_grid.nearby(spawn_x, spawn_y):
+            dx_to_spawn = spawn_x - v.x
+            dy_to_spawn = spawn_y - v.y
+            d2 = dx_to_spawn * dx_to_spawn + dy_to_spawn * dy_to_spawn
+            if d2 < 120 * 120:  # Increased minimum distance
                 return  # Don't spawn if too close to existing vehicle
             
             # Also check if vehicle is approaching spawn point with larger buffer
-            angle_rad = math.radians(v.angle)
-            dx_to_spawn = spawn_x - v.x
-            dy_to_spawn = spawn_y - v.y
-            dot_product = dx_to_spawn * math.cos(angle_rad) + dy_to_spawn * math.sin(angle_rad)
+            dot_product = dx_to_spawn * v._dx + dy_to_spawn * v._dy
             
             # If vehicle is moving towards spawn point and close, don't spawn
-            if dot_product > 0 and distance < 200:  # Increased buffer distance
+            if dot_product > 0 and d2 < 200 * 200:  # Increased buffer distance
                 return
             
             # Additional check for vehicles that might be very close in perpendicular direction
-            cross_product = abs(dx_to_spawn * math.sin(angle_rad) - dy_to_spawn * math.cos(angle_rad))
-            if cross_product < 50 and distance < 150:  # Don't spawn if vehicle is close in any lane
+            cross_product = abs(dx_to_spawn * v._dy - dy_to_spawn * v._dx)
+            if cross_product < 50 and d2 < 150 * 150:  # Don't spawn if vehicle is close in any lane
                 return
 
         destination = self.lane_manager.get_random_destination(spawn_lane)
-        new_vehicle = VehicleFactory.create_random_vehicle(
-            spawn_x, spawn_y, spawn_lane.direction_angle,
-            spawn_lane, destination, self.vehicle_distribution
+        new_vehicle = VehicleFactory.create_vehicle(
+            self._type_sampler.sample(), spawn_x, spawn_y,
+            spawn_lane.direction_angle, spawn_lane, destination
         )
         self.vehicles.append(new_vehicle)
     
     def draw_vehicles(self, screen):
+        blit_seq = []
         for vehicle in self.vehicles:
-            vehicle.draw(screen)
+            sprite = vehicle.get_sprite()
+            blit_seq.append((sprite, (vehicle.x - sprite.get_width() / 2,
+                                      vehicle.y - sprite.get_height() / 2)))
+        if blit_seq:
+            screen.blits(blit_seq, doreturn=0)
 
     def draw_debug_info(self, screen, show_collision_zones=False):
-        # Draw intersection bounds
-        bounds = self.lane_manager.intersection_bounds
-        pygame.draw.rect(screen, (255, 0, 0), (bounds['left'], bounds['top'], bounds['right'] - bounds['left'], bounds['bottom'] - bounds['top']), 2)
-        
-        # Draw lane centers
-        for lane in self.lane_manager.lanes:
-            pygame.draw.circle(screen, (255,0,0), (int(lane.center_x), int(lane.center_y)), 3)
-        
+        # Lane centers and intersection bounds are static between road
+        # config changes, so they are rendered once onto a transparent
+        # overlay and blitted per frame instead of re-issuing a draw
+        # call per lane
+        if self._lane_debug_surf is None:
+            surf = pygame.Surface((1920, 1080), pygame.SRCALPHA)
+            bounds = self.lane_manager.intersection_bounds
+            pygame.draw.rect(surf, (255, 0, 0), (bounds['left'], bounds['top'], bounds['right'] - bounds['left'], bounds['bottom'] - bounds['top']), 2)
+            for lane in self.lane_manager.lanes:
+                pygame.draw.circle(surf, (255,0,0), (int(lane.center_x), int(lane.center_y)), 3)
+            self._lane_debug_surf = surf
+        screen.blit(self._lane_debug_surf, (0, 0))
+
         # Draw collision detection zones if enabled
         if show_collision_zones:
             for vehicle in self.vehicles:
@@ -523,7 +1003,11 @@ class VehicleSpawner:
                 vehicle_ahead, _ = vehicle.get_vehicle_ahead(self.vehicles)
                 vehicle.draw_collision_zones(screen, vehicle_ahead)
 
-    def clear_vehicles(self): self.vehicles = []
+    def clear_vehicles(self):
+        self.vehicles = []
+        # Drop the grid's references too, or spawn checks keep seeing
+        # the cleared vehicles
+        self.neighbor_grid.rebuild(self.vehicles)
     def get_vehicle_count(self): return len(self.vehicles)
     def set_spawn_rate(self, interval): self.spawn_interval = interval
     def set_max_vehicles(self, max_count): self.max_vehicles = max_count